@@ -0,0 +1,70 @@
+"""Registry of PDF to Markdown converters.
+
+Converter backends are imported on first use only, so callers that never
+convert (argument parsing, listing converters) do not pay for pdfplumber or
+pdfminer imports. Third-party converters can be added through the
+``docsforcopilot.converters`` entry point group; each entry point must resolve
+to a callable taking a PDF path and returning Markdown text.
+
+To check that startup stays cheap, run from src/
+
+    python -X importtime 3__pdfconvert.py --list-converters 2>&1 >/dev/null | grep -E "pdfplumber|pdfminer"
+
+which should print nothing: no backend is imported when nothing is converted.
+"""
+import importlib
+
+ENTRY_POINT_GROUP = "docsforcopilot.converters"
+
+# Built-in converters as name -> (module, function), resolved lazily
+BUILTIN_CONVERTERS = {
+    "pdfplumber": ("converters.pdf_to_markdown_pdfplumber", "pdf_to_markdown_pdfplumber"),
+    "markdownify": ("converters.pdf_to_markdown_markdownify", "pdf_to_markdown_markdownify"),
+}
+
+# Converter to try when another one produces empty output
+FALLBACK_CONVERTERS = {
+    "pdfplumber": "markdownify",
+    "markdownify": "pdfplumber",
+}
+
+DEFAULT_CONVERTER = "pdfplumber"
+
+_loaded = {}
+_entry_points = None
+
+
+def _get_entry_points():
+    """Return converter entry points by name, scanning package metadata once."""
+    global _entry_points
+    if _entry_points is None:
+        from importlib.metadata import entry_points
+        _entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    return _entry_points
+
+
+def available_converters():
+    """Return the names of all built-in and entry point converters."""
+    return sorted(set(BUILTIN_CONVERTERS) | set(_get_entry_points()))
+
+
+def get_converter(name):
+    """Return the converter function registered under name, importing it on first use."""
+    if name in _loaded:
+        return _loaded[name]
+    if name in BUILTIN_CONVERTERS:
+        module_name, function_name = BUILTIN_CONVERTERS[name]
+        converter = getattr(importlib.import_module(module_name), function_name)
+    elif name in _get_entry_points():
+        converter = _get_entry_points()[name].load()
+    else:
+        raise ValueError(
+            f"Unknown converter: {name}. Available converters: {', '.join(available_converters())}"
+        )
+    _loaded[name] = converter
+    return converter
+
+
+def get_fallback_converter(name):
+    """Return the name of the converter to retry with after empty output."""
+    return FALLBACK_CONVERTERS.get(name, DEFAULT_CONVERTER)
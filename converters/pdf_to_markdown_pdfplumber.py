@@ -1,53 +1,73 @@
+import os
+import re
+import json
+import hashlib
 import pdfplumber
 from collections import defaultdict
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
 
 def extract_text_with_font_info(pdf_path):
     pages_content = []
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
-            page_content = []
-            # Extract regular text
-            for char in page.chars:
-                page_content.append({
-                    'type': 'text',
-                    'text': char['text'],
-                    'font_size': char['size'],
-                    'top': char['top']
-                })
-            
-            # Extract tables (potential code blocks)
-            tables = page.find_tables()
-            for table in tables:
-                if len(table.rows) == 2 and len(table.cells[0]) == 1:  # Single-cell table with header
-                    header = table.rows[0][0]
-                    code = table.rows[1][0]
-                    page_content.append({
-                        'type': 'code_block',
-                        'header': header,
-                        'code': code,
-                        'top': table.bbox[1]  # Use the top of the table as the position
-                    })
-            
-            # Sort the page content by vertical position
-            page_content.sort(key=lambda x: x['top'])
-            pages_content.append(page_content)
+            pages_content.append(extract_page_content(page))
     return pages_content
 
+def extract_page_content(page):
+    page_content = []
+    # Extract regular text
+    for char in page.chars:
+        page_content.append({
+            'type': 'text',
+            'text': char['text'],
+            'font_size': char['size'],
+            'top': char['top']
+        })
+    
+    # Extract tables (potential code blocks)
+    tables = page.find_tables()
+    for table in tables:
+        if len(table.rows) == 2 and len(table.cells[0]) == 1:  # Single-cell table with header
+            header = table.rows[0][0]
+            code = table.rows[1][0]
+            page_content.append({
+                'type': 'code_block',
+                'header': header,
+                'code': code,
+                'top': table.bbox[1]  # Use the top of the table as the position
+            })
+    
+    # Sort the page content by vertical position
+    page_content.sort(key=lambda x: x['top'])
+    return page_content
+
+def count_font_sizes(page_content):
+    font_sizes = defaultdict(int)
+    for element in page_content:
+        if element['type'] == 'text':
+            font_sizes[element['font_size']] += 1
+    return font_sizes
+
 def determine_header_levels(pages_content):
     font_sizes = defaultdict(int)
     for page in pages_content:
-        for element in page:
-            if element['type'] == 'text':
-                font_sizes[element['font_size']] += 1
-    
+        for size, count in count_font_sizes(page).items():
+            font_sizes[size] += count
+    return header_levels_from_font_sizes(font_sizes)
+
+def header_levels_from_font_sizes(font_sizes):
     sorted_sizes = sorted(font_sizes.keys(), reverse=True)
     header_levels = {}
     for i, size in enumerate(sorted_sizes[:6]):  # Consider top 6 sizes as potential headers
         header_levels[size] = i + 1
     return header_levels
 
-def convert_to_markdown(pages_content, header_levels):
-    markdown_content = ""
+def iter_markdown_chunks(pages_content, header_levels):
+    """Yield (markdown, header_level) chunks in document order.
+
+    header_level is the Markdown header level for header lines and None for
+    everything else.
+    """
     current_line = ""
     current_font_size = None
     for page in pages_content:
@@ -60,7 +80,7 @@ def convert_to_markdown(pages_content, header_levels):
 
                 if prev_top is not None and top - prev_top > 5:  # New line
                     if current_line:
-                        markdown_content += process_line(current_line, current_font_size, header_levels)
+                        yield line_chunk(current_line, current_font_size, header_levels)
                         current_line = ""
                         current_font_size = None
 
@@ -71,20 +91,26 @@ def convert_to_markdown(pages_content, header_levels):
                 prev_top = top
             elif element['type'] == 'code_block':
                 if current_line:
-                    markdown_content += process_line(current_line, current_font_size, header_levels)
+                    yield line_chunk(current_line, current_font_size, header_levels)
                     current_line = ""
                     current_font_size = None
-                markdown_content += process_code_block(element['header'], element['code'])
+                yield process_code_block(element['header'], element['code']), None
 
         # Process the last line of the page
         if current_line:
-            markdown_content += process_line(current_line, current_font_size, header_levels)
+            yield line_chunk(current_line, current_font_size, header_levels)
             current_line = ""
             current_font_size = None
 
-        markdown_content += "\n"  # Add a newline between pages
+        yield "\n", None  # Add a newline between pages
 
-    return markdown_content
+def convert_to_markdown(pages_content, header_levels):
+    return "".join(chunk for chunk, _ in iter_markdown_chunks(pages_content, header_levels))
+
+def line_chunk(line, font_size, header_levels):
+    """Return (markdown, header_level) for a line, header_level being None for non-headers."""
+    header_level = header_levels[font_size] if line.strip() and font_size in header_levels else None
+    return process_line(line, font_size, header_levels), header_level
 
 def process_line(line, font_size, header_levels):
     line = line.strip()
@@ -107,6 +133,180 @@ def pdf_to_markdown_pdfplumber(input_pdf_path):
     markdown_output = convert_to_markdown(pages_content, header_levels)
     return markdown_output
 
+def _hash_pdf_object(obj, digest, memo, depth=0):
+    """Feed a PDF object, following references, into a hash in a stable order.
+
+    Referenced objects are hashed once per document and memoised by object id;
+    only their content enters the hash, so renumbered objects hash the same.
+    """
+    if depth > 32:
+        return
+    if isinstance(obj, PDFObjRef):
+        if obj.objid not in memo:
+            memo[obj.objid] = b"cycle"
+            sub_digest = hashlib.sha256()
+            _hash_pdf_object(resolve1(obj), sub_digest, memo, depth + 1)
+            memo[obj.objid] = sub_digest.digest()
+        digest.update(memo[obj.objid])
+    elif isinstance(obj, PDFStream):
+        digest.update(b"stream:")
+        _hash_pdf_object(obj.attrs, digest, memo, depth + 1)
+        digest.update(obj.get_data() or b"")
+    elif isinstance(obj, dict):
+        digest.update(b"dict:")
+        for key in sorted(obj, key=str):
+            digest.update(str(key).encode())
+            _hash_pdf_object(obj[key], digest, memo, depth + 1)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"list:")
+        for item in obj:
+            _hash_pdf_object(item, digest, memo, depth + 1)
+    elif isinstance(obj, bytes):
+        digest.update(obj)
+    else:
+        digest.update(repr(obj).encode())
+
+def page_fingerprint(page, memo=None):
+    """Hash a page's content streams, resources and geometry without laying it out."""
+    memo = {} if memo is None else memo
+    digest = hashlib.sha256()
+    page_obj = page.page_obj
+    _hash_pdf_object(page_obj.contents, digest, memo)
+    _hash_pdf_object(page_obj.resources, digest, memo)
+    digest.update(repr((page_obj.mediabox, page_obj.cropbox, page_obj.rotate)).encode())
+    return digest.hexdigest()
+
+def load_page_cache(cache_path):
+    """Load the page-fragment cache written next to a Markdown output, or None."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def pdf_to_markdown_pdfplumber_incremental(input_pdf_path, cache_path):
+    """Convert a PDF, re-extracting only pages whose fingerprint is not in the cache.
+
+    The cache stores, per page fingerprint, the page's font size counts and its
+    Markdown fragment. Pages convert independently once the document's header
+    levels are known, so unchanged pages are spliced in from the cache. If the
+    header levels differ from the cached run, every page is re-extracted.
+    Returns (markdown, reused_pages, total_pages).
+    """
+    cache = load_page_cache(cache_path) or {}
+    cached_pages = {entry["fingerprint"]: entry for entry in cache.get("pages", [])}
+    cached_levels = {size: level for size, level in cache.get("header_levels", [])}
+
+    with pdfplumber.open(input_pdf_path) as pdf:
+        memo = {}
+        fingerprints = [page_fingerprint(page, memo) for page in pdf.pages]
+        fresh = {}
+        for number, fingerprint in enumerate(fingerprints):
+            if fingerprint not in cached_pages and fingerprint not in fresh:
+                fresh[fingerprint] = extract_page_content(pdf.pages[number])
+
+        def font_sizes_for(fingerprint):
+            if fingerprint in fresh:
+                return count_font_sizes(fresh[fingerprint])
+            return {size: count for size, count in cached_pages[fingerprint]["font_sizes"]}
+
+        page_font_sizes = {fingerprint: font_sizes_for(fingerprint) for fingerprint in set(fingerprints)}
+        font_sizes = defaultdict(int)
+        for fingerprint in fingerprints:
+            for size, count in page_font_sizes[fingerprint].items():
+                font_sizes[size] += count
+        header_levels = header_levels_from_font_sizes(font_sizes)
+
+        if header_levels != cached_levels:
+            # Cached fragments were rendered with other header levels
+            for number, fingerprint in enumerate(fingerprints):
+                if fingerprint not in fresh:
+                    fresh[fingerprint] = extract_page_content(pdf.pages[number])
+
+    fragments = {}
+    for fingerprint in fingerprints:
+        if fingerprint in fragments:
+            continue
+        if fingerprint in fresh:
+            fragments[fingerprint] = convert_to_markdown([fresh[fingerprint]], header_levels)
+        else:
+            fragments[fingerprint] = cached_pages[fingerprint]["markdown"]
+
+    new_cache = {
+        "header_levels": sorted(header_levels.items()),
+        "pages": [
+            {"fingerprint": fingerprint,
+             "font_sizes": sorted(page_font_sizes[fingerprint].items()),
+             "markdown": fragments[fingerprint]}
+            for fingerprint in dict.fromkeys(fingerprints)
+        ],
+    }
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(new_cache, f)
+    os.replace(tmp_path, cache_path)
+
+    reused = sum(1 for fingerprint in fingerprints if fingerprint not in fresh)
+    return "".join(fragments[fingerprint] for fingerprint in fingerprints), reused, len(fingerprints)
+
+def type_file_name(header, used_names):
+    """Return a unique, filesystem-safe Markdown file name for a type header."""
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', header.lstrip('#').strip()).strip('_.') or "type"
+    file_name = f"{name}.md"
+    counter = 2
+    while file_name.lower() in used_names:
+        file_name = f"{name}_{counter}.md"
+        counter += 1
+    used_names.add(file_name.lower())
+    return file_name
+
+def write_split_markdown(pages_content, header_levels, output_dir, split_level=1):
+    """Write one Markdown file per top-level header in a single streaming pass.
+
+    Text before the first header goes to _preamble.md. An index.json file maps
+    each type header to its file and the file's size in bytes ("length"), and
+    to "source_offset", the byte offset at which the type starts in the unsplit
+    document: _preamble.md followed by the type files in index order. Every
+    type file starts at its header, so offsets within a file are always 0.
+    Returns the index entries.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    used_names = {"_preamble.md", "index.json"}
+    index = []
+    offset = 0
+    current = open(os.path.join(output_dir, "_preamble.md"), "w", encoding="utf-8")
+    current_entry = None
+    try:
+        for chunk, header_level in iter_markdown_chunks(pages_content, header_levels):
+            if header_level is not None and header_level <= split_level:
+                current.close()
+                file_name = type_file_name(chunk, used_names)
+                current_entry = {"name": chunk.lstrip('#').strip(), "file": file_name,
+                                 "source_offset": offset, "length": 0}
+                index.append(current_entry)
+                current = open(os.path.join(output_dir, file_name), "w", encoding="utf-8")
+            size = len(chunk.encode("utf-8"))
+            current.write(chunk)
+            offset += size
+            if current_entry is not None:
+                current_entry["length"] += size
+    finally:
+        current.close()
+
+    preamble_path = os.path.join(output_dir, "_preamble.md")
+    if os.path.getsize(preamble_path) == 0:
+        os.remove(preamble_path)
+
+    with open(os.path.join(output_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({"types": index}, f, indent=1)
+    return index
+
+def pdf_to_markdown_pdfplumber_split(input_pdf_path, output_dir, split_level=1):
+    pages_content = extract_text_with_font_info(input_pdf_path)
+    header_levels = determine_header_levels(pages_content)
+    return write_split_markdown(pages_content, header_levels, output_dir, split_level)
+
 # The main execution part is left commented out as it's typically not included in module files
 # pdf_path = "your_pdf_file.pdf"
 # markdown_output = pdf_to_markdown_pdfminer(pdf_path)
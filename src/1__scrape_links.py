@@ -1,13 +1,10 @@
 """Scrape links from Microsoft .NET API documentation using Selenium WebDriver."""
 
 import os
-import sys
-
-# Add the parent directory to sys.path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
+import argparse
+from contextlib import nullcontext
 
+import project_paths  # Adds the project root to sys.path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -15,31 +12,41 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from config import CHROME_DRIVER_PATH
+from config import CHROME_DRIVER_PATH, DOCS_API_URL
 from src.utils.file_operations import create_directory
 from src.utils.path_operations import get_absolute_path
+from src.utils.browser_options import apply_lean_options, block_resources, LatencyRecorder
 
-def setup_driver():
+def setup_driver(lean=False):
     """Set up and return the Chrome WebDriver with custom options."""
     options = Options()
     options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
     options.add_experimental_option("useAutomationExtension", False)
     options.add_argument("--log-level=3")  # Only show fatal errors
     options.add_argument("--silent")
+    if lean:
+        apply_lean_options(options)
     service = Service(executable_path=CHROME_DRIVER_PATH)
-    return webdriver.Chrome(service=service, options=options)
+    driver = webdriver.Chrome(service=service, options=options)
+    if lean:
+        block_resources(driver)
+    return driver
+
+def get_links(driver, url, view, api_url=DOCS_API_URL, latency=None):
+    """Navigate to the URL and extract relevant links matching the specified view.
 
-def get_links(driver, url, view):
-    """Navigate to the URL and extract relevant links matching the specified view."""
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//a[@href]")))
+    If latency (a LatencyRecorder) is given, the page load is recorded as one sample.
+    """
+    with latency.time() if latency else nullcontext():
+        driver.get(url)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//a[@href]")))
     links = driver.find_elements(By.XPATH, "//a[@href]")
-    return [
-        link.get_attribute("href")
-        for link in links
-        if link.get_attribute("href").startswith("https://learn.microsoft.com/en-us/dotnet/api/")
-        and f"view={view}" in link.get_attribute("href")
-    ]
+    matching = []
+    for link in links:
+        href = link.get_attribute("href")
+        if href.startswith(api_url) and f"view={view}" in href:
+            matching.append(href)
+    return matching
 
 def save_links(links, output_file):
     """Save the extracted links to a file and print them to console."""
@@ -71,19 +78,37 @@ def select_url(urls):
         except ValueError:
             print("Invalid input. Please enter a number.")
 
+def parse_arguments():
+    """Parse command-line arguments for the link scraper."""
+    parser = argparse.ArgumentParser(description="Scrape .NET API documentation links.")
+    parser.add_argument("--lean", action="store_true",
+                        help="Block images, fonts, stylesheets and telemetry and use eager page loads")
+    parser.add_argument("--url",
+                        help="Page to scrape, e.g. a local docs stand-in (default: choose from data/links_to_scrape.txt)")
+    parser.add_argument("--api_url",
+                        help=f"Prefix of the API links to keep (default: the --url path, or {DOCS_API_URL})")
+    return parser.parse_args()
+
 def main():
     """Main function to set up the driver, scrape links, and save them to a file."""
-    urls_file = get_absolute_path("data/links_to_scrape.txt")
-    
-    urls = read_urls_from_file(urls_file)
-    url_to_parse = select_url(urls)
-    
+    args = parse_arguments()
+    if args.url:
+        url_to_parse = args.url
+        api_url = args.api_url or url_to_parse.split("?")[0]
+    else:
+        urls_file = get_absolute_path("data/links_to_scrape.txt")
+        urls = read_urls_from_file(urls_file)
+        url_to_parse = select_url(urls)
+        api_url = args.api_url or DOCS_API_URL
+
     view = url_to_parse.split('view=')[-1].split('&')[0]
     output_file = get_absolute_path(f"data/scraped_links_{view}.txt")
 
     try:
-        with setup_driver() as driver:
-            links = get_links(driver, url_to_parse, view)
+        with setup_driver(lean=args.lean) as driver:
+            latency = LatencyRecorder("Scrape", unit="pages")
+            links = get_links(driver, url_to_parse, view, api_url, latency)
+            print(latency.summary())
             if links:
                 save_links(links, output_file)
                 print(f"{len(links)} links have been saved to {output_file}")
@@ -1,8 +1,8 @@
 import os
 import sys
 import logging
+import itertools
 import requests
-from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,14 +13,17 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 
 from utils.file_operations import rename_files_remove_splitted, cleanup_crdownload_files
-from utils.link_operations import read_links_from_file
+from utils.download_operations import pdf_filename_for_link, save_pdf
+from utils.link_operations import read_links_from_file, deduplicate_links
+from utils.work_queue import WorkQueue, run_worker, default_worker_id
 from utils.argument_parser import parse_arguments
+from utils.browser_options import apply_lean_options, block_resources, keep_single_tab, LatencyRecorder
 from utils.configure_paths import get_config_settings
 
 from config import DEFAULT_DOWNLOAD_DIR, DEFAULT_LINKS_FILE
 
 
-def initialize_driver(download_dir, headless=False):
+def initialize_driver(download_dir, headless=False, lean=False):
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -52,20 +55,33 @@ def initialize_driver(download_dir, headless=False):
         },
     )
 
+    if lean:
+        apply_lean_options(chrome_options)
+
     driver = webdriver.Chrome(
         service=Service(ChromeDriverManager().install()), options=chrome_options
     )
+    if lean:
+        block_resources(driver)
     return driver
 
 
-def download_pdf(driver, link, idx, download_dir):
+def sync_session_cookies(driver, session):
+    """Copy the browser's cookies into a requests session."""
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+
+
+def download_pdf(driver, link, idx, download_dir, session=None, lean=False):
+    """Download the PDF for a docs link.
+
+    In lean mode the PDF button only needs to be present (it is clicked from
+    JavaScript), the browser is kept to a single tab, and the PDF is fetched
+    with the given requests session carrying the browser's cookies.
+    """
     try:
         # Extract the PDF filename from the link
-        parsed_url = urlparse(link)
-        pdf_filename = parsed_url.path.split("/")[-1]
-        if not pdf_filename:
-            pdf_filename = f"default_{idx}"
-        pdf_filename += ".pdf"
+        pdf_filename = pdf_filename_for_link(link, idx)
         pdf_path = os.path.join(download_dir, pdf_filename)
 
         logging.info(f"Processing link {idx}: {link}")
@@ -91,10 +107,9 @@ def download_pdf(driver, link, idx, download_dir):
 
         # Find and click the PDF download button
         try:
+            button_condition = EC.presence_of_element_located if lean else EC.element_to_be_clickable
             pdf_button = WebDriverWait(driver, 20).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, "//button[@data-bi-name='download-pdf']")
-                )
+                button_condition((By.XPATH, "//button[@data-bi-name='download-pdf']"))
             )
             driver.execute_script("arguments[0].click();", pdf_button)
             logging.info(f"PDF button clicked for link {idx}")
@@ -125,33 +140,45 @@ def download_pdf(driver, link, idx, download_dir):
         logging.info(f"PDF URL for link {idx}: {pdf_url}")
 
         # Download the PDF using requests
-        response = requests.get(pdf_url, stream=True, timeout=30)
-        response.raise_for_status()
+        if session is not None:
+            sync_session_cookies(driver, session)
+            return save_pdf(session, pdf_url, pdf_path, idx)
+        return save_pdf(requests, pdf_url, pdf_path, idx)
 
-        with open(pdf_path, "wb") as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
+    except Exception as e:
+        logging.error(f"Error downloading PDF for link {idx}: {str(e)}")
+        return False
 
-        if not os.path.exists(pdf_path):
-            logging.warning(
-                "PDF file does not exist for link %s: %s", idx, pdf_filename
-            )
-            return False
 
-        if os.path.getsize(pdf_path) <= 0:
-            logging.warning(
-                "Downloaded file is empty for link %s: %s", idx, pdf_filename
-            )
-            os.remove(pdf_path)
-            logging.warning("Deleted empty PDF file for link %s: %s", idx, pdf_filename)
-            return False
+def download_link(driver, link, idx, download_dir, session=None, lean=False):
+    """Download one link, keeping the browser on a single tab in lean mode."""
+    main_handle = driver.current_window_handle
+    try:
+        return download_pdf(driver, link, idx, download_dir, session, lean)
+    finally:
+        if lean:
+            keep_single_tab(driver, main_handle)
 
-        logging.info("Successfully downloaded PDF for link %s: %s", idx, pdf_filename)
-        return True
 
-    except Exception as e:
-        logging.error(f"Error downloading PDF for link {idx}: {str(e)}")
-        return False
+def run_download_queue(driver, links, download_dir, queue_dir, worker_id=None,
+                       session=None, lean=False, latency=None):
+    """Enqueue links in the shared work queue and download whatever this worker claims."""
+    worker_id = worker_id or default_worker_id()
+    latency = latency or LatencyRecorder("Download")
+    queue = WorkQueue(queue_dir, "download")
+    unique_links = deduplicate_links(links)
+    added = queue.enqueue(unique_links)
+    print(f"Enqueued {added} new links ({len(unique_links)} unique of {len(links)} read)")
+
+    claim_counter = itertools.count()
+
+    def process_link(link):
+        with latency.time():
+            return download_link(driver, link, next(claim_counter), download_dir, session, lean)
+
+    succeeded, failed = run_worker(queue, worker_id, process_link)
+    print(f"Worker {worker_id} downloaded {succeeded} PDFs, {failed} failed")
+    print(f"Queue status: {queue.counts()}")
 
 
 def main():
@@ -189,7 +216,9 @@ def main():
         return
 
     print("Initializing WebDriver")
-    driver = initialize_driver(download_dir, headless=True)  # Set headless to True
+    driver = initialize_driver(download_dir, headless=True, lean=args.lean)  # Set headless to True
+    session = requests.Session() if args.lean else None
+    latency = LatencyRecorder("Download")
 
     print("Reading links from file")
     links = read_links_from_file(links_file)
@@ -197,14 +226,20 @@ def main():
 
     print("Starting download process")
     try:
-        for idx, link in enumerate(links):
-            success = download_pdf(driver, link, idx, download_dir)
-            if not success:
-                logging.warning(f"Failed to download PDF for link {idx}: {link}")
+        if args.queue_dir:
+            run_download_queue(driver, links, download_dir, args.queue_dir, args.worker_id,
+                               session, args.lean, latency)
+        else:
+            for idx, link in enumerate(links):
+                with latency.time():
+                    success = download_link(driver, link, idx, download_dir, session, args.lean)
+                if not success:
+                    logging.warning(f"Failed to download PDF for link {idx}: {link}")
     except Exception as e:
         logging.error(f"Error during download process: {str(e)}")
 
     print("Download process completed")
+    print(latency.summary())
     logging.info("Download process completed.")
     rename_files_remove_splitted(download_dir)
     cleanup_crdownload_files(download_dir)
@@ -1,35 +1,78 @@
 import os
-import pdfplumber
-from pdfminer.pdfparser import PDFSyntaxError
+import shutil
 
-from src.converters.pdf_to_markdown_pdfplumber import pdf_to_markdown_pdfplumber
-from src.converters.pdf_to_markdown_markdownify import pdf_to_markdown_markdownify
-from src.utils.argument_parser import parse_arguments, process_arguments
+import project_paths  # Adds the project root to sys.path
+from converters import get_converter, get_fallback_converter, available_converters
+from utils.argument_parser import parse_arguments, process_arguments
+from utils.work_queue import WorkQueue, run_worker, default_worker_id
+from utils.archive_store import ArchiveWriter
+
+PAGE_CACHE_SUFFIX = ".pages.json"
+PAGE_CACHE_DIR_SUFFIX = ".page_cache"
+
+
+def page_cache_path(output_markdown_path, archive=None):
+    """Return the incremental page cache path for a Markdown output.
+
+    Plain Markdown keeps its cache next to the file; archived Markdown keeps it
+    in a directory beside the archive, so the archive holds only its shards.
+    """
+    if archive is None:
+        return output_markdown_path + PAGE_CACHE_SUFFIX
+    cache_dir = os.path.normpath(archive.archive_dir) + PAGE_CACHE_DIR_SUFFIX
+    return os.path.join(cache_dir, os.path.basename(output_markdown_path) + PAGE_CACHE_SUFFIX)
+
+def pdf_to_markdown(input_pdf_path, output_markdown_path, converter="pdfplumber", archive=None,
+                    incremental=False):
+    """Convert a PDF to Markdown.
+
+    If archive is an ArchiveWriter, the Markdown is stored in it under the file
+    name of output_markdown_path instead of being written to disk. With
+    incremental, pdfplumber only re-extracts pages that changed since the last
+    run, using the page cache at page_cache_path().
+
+    Returns True if Markdown was written, False otherwise.
+    """
+    try:
+        convert = get_converter(converter)
+    except ValueError as e:
+        print(f"Invalid converter: {e}")
+        return False
+    if incremental and converter != "pdfplumber":
+        print(f"Incremental conversion is only supported by pdfplumber, not {converter}")
+        return False
+
+    # pdfminer is imported here rather than at module load to keep startup cheap
+    from pdfminer.pdfparser import PDFSyntaxError
 
-def pdf_to_markdown(input_pdf_path, output_markdown_path, converter="pdfplumber"):
     try:
-        if converter == "markdownify":
-            markdown_text = pdf_to_markdown_markdownify(input_pdf_path)
-        elif converter == "pdfplumber":
-            markdown_text = pdf_to_markdown_pdfplumber(input_pdf_path)
+        if incremental:
+            from converters.pdf_to_markdown_pdfplumber import pdf_to_markdown_pdfplumber_incremental
+
+            markdown_text, reused, total = pdf_to_markdown_pdfplumber_incremental(
+                input_pdf_path, page_cache_path(output_markdown_path, archive)
+            )
+            print(f"Reused {reused} of {total} pages from the page cache")
         else:
-            print(f"Invalid converter: {converter}")
-            return
+            markdown_text = convert(input_pdf_path)
 
         print(f"Using converter: {converter}")
 
         # Check if the generated markdown is empty
         if not markdown_text.strip():
             print(f"Warning: Empty markdown generated with {converter}. Trying alternative converter.")
-            if converter == "pdfplumber":
-                markdown_text = pdf_to_markdown_markdownify(input_pdf_path)
-            else:
-                markdown_text = pdf_to_markdown_pdfplumber(input_pdf_path)
+            markdown_text = get_converter(get_fallback_converter(converter))(input_pdf_path)
+
+        if archive is not None:
+            archive.write_text(os.path.basename(output_markdown_path), markdown_text)
+            print(f"Markdown stored in archive {archive.archive_dir} as: {os.path.basename(output_markdown_path)}")
+            return True
 
         with open(output_markdown_path, "w", encoding="utf-8") as f:
             f.write(markdown_text)
 
         print(f"Markdown file created at: {output_markdown_path}")
+        return True
 
     except PDFSyntaxError as e:
         print(f"PDFSyntaxError occurred while processing {input_pdf_path}: {e}")
@@ -39,6 +82,7 @@ def pdf_to_markdown(input_pdf_path, output_markdown_path, converter="pdfplumber"
         if os.path.exists(output_markdown_path):
             os.remove(output_markdown_path)
             print(f"Deleted offending Markdown file: {output_markdown_path}")
+        return False
     except IOError as e:
         print(f"An IOError occurred while processing {input_pdf_path}: {e}")
         with open("bad_pdfs.txt", "a", encoding="utf-8") as f:
@@ -47,6 +91,7 @@ def pdf_to_markdown(input_pdf_path, output_markdown_path, converter="pdfplumber"
         if os.path.exists(output_markdown_path):
             os.remove(output_markdown_path)
             print(f"Deleted offending Markdown file: {output_markdown_path}")
+        return False
     except Exception as e:
         print(f"An unexpected error occurred while processing {input_pdf_path}: {e}")
         with open("bad_pdfs.txt", "a", encoding="utf-8") as f:
@@ -55,10 +100,62 @@ def pdf_to_markdown(input_pdf_path, output_markdown_path, converter="pdfplumber"
         if os.path.exists(output_markdown_path):
             os.remove(output_markdown_path)
             print(f"Deleted offending Markdown file: {output_markdown_path}")
+        return False
+
+def pdf_to_markdown_split(input_pdf_path, output_dir):
+    """Convert a PDF with pdfplumber into one Markdown file per type, plus index.json, in output_dir.
+
+    The files are written to a temporary directory that replaces output_dir
+    once complete, so types removed from the PDF do not linger from earlier runs.
+    """
+    from converters.pdf_to_markdown_pdfplumber import pdf_to_markdown_pdfplumber_split
+
+    partial_dir = output_dir + ".partial"
+    try:
+        if os.path.exists(partial_dir):
+            shutil.rmtree(partial_dir)
+        index = pdf_to_markdown_pdfplumber_split(input_pdf_path, partial_dir)
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(partial_dir, output_dir)
+        print(f"Split into {len(index)} type files in: {output_dir}")
+    except Exception as e:
+        print(f"An unexpected error occurred while processing {input_pdf_path}: {e}")
+        with open("bad_pdfs.txt", "a", encoding="utf-8") as f:
+            bad_pdf = os.path.basename(input_pdf_path)
+            f.write(f"{bad_pdf} - Unexpected Error: {str(e)}\n")
+        if os.path.exists(partial_dir):
+            shutil.rmtree(partial_dir)
+            print(f"Deleted offending Markdown directory: {partial_dir}")
+
+def run_convert_queue(pdf_files, pdf_directory, markdown_directory, converter,
+                      queue_dir, worker_id=None, incremental=False):
+    """Enqueue PDF files in the shared work queue and convert whatever this worker claims."""
+    worker_id = worker_id or default_worker_id()
+    queue = WorkQueue(queue_dir, "convert")
+    added = queue.enqueue(pdf_files)
+    print(f"Enqueued {added} new PDF files ({len(pdf_files)} found)")
+
+    def process_pdf(filename):
+        pdf_path = os.path.join(pdf_directory, filename)
+        markdown_path = os.path.join(markdown_directory, os.path.splitext(filename)[0] + ".md")
+        print(f"Worker {worker_id} processing file: {filename}")
+        return pdf_to_markdown(pdf_path, markdown_path, converter, incremental=incremental)
+
+    succeeded, failed = run_worker(queue, worker_id, process_pdf)
+    print(f"Worker {worker_id} converted {succeeded} PDF files, {failed} failed")
+    print(f"Queue status: {queue.counts()}")
 
 def main():
     args = parse_arguments()
+    if args.list_converters:
+        print("\n".join(available_converters()))
+        return
     pdf_directory, markdown_directory, converter_to_use = process_arguments(args)
+    if converter_to_use and converter_to_use not in available_converters():
+        print(f"Error: Unknown converter: {converter_to_use}. "
+              f"Available converters: {', '.join(available_converters())}")
+        return
 
     pdf_directory = os.path.abspath(pdf_directory)
     markdown_directory = os.path.abspath(markdown_directory)
@@ -79,13 +176,40 @@ def main():
 
     print(f"Using converter: {converter_to_use}")  # Add this line for debugging
 
-    for index, filename in enumerate(pdf_files, start=1):
-        pdf_path = os.path.join(pdf_directory, filename)
-        markdown_filename = os.path.splitext(filename)[0] + ".md"
-        markdown_path = os.path.join(markdown_directory, markdown_filename)
-        print(f"Processing file {index} of {total_files}: {filename}")
-        pdf_to_markdown(pdf_path, markdown_path, converter_to_use)
-        print(f"Completed file {index} of {total_files}: {filename}")
+    if args.split and (args.archive or converter_to_use != "pdfplumber"):
+        print("Error: --split requires the pdfplumber converter and cannot be combined with --archive.")
+        return
+    if args.incremental and (args.split or converter_to_use != "pdfplumber"):
+        print("Error: --incremental requires the pdfplumber converter and cannot be combined with --split.")
+        return
+
+    if args.queue_dir:
+        if args.archive or args.split:
+            # Queue workers write one plain Markdown file per PDF
+            print("Warning: --archive and --split are ignored when running from a work queue.")
+        run_convert_queue(pdf_files, pdf_directory, markdown_directory, converter_to_use,
+                          args.queue_dir, args.worker_id, args.incremental)
+        return
+
+    archive = None
+    if args.archive:
+        archive = ArchiveWriter(markdown_directory, codec=args.codec, shards=args.shards)
+        print(f"Writing {args.codec}-compressed archive with {archive.shards} shards to: {markdown_directory}")
+
+    try:
+        for index, filename in enumerate(pdf_files, start=1):
+            pdf_path = os.path.join(pdf_directory, filename)
+            markdown_filename = os.path.splitext(filename)[0] + ".md"
+            markdown_path = os.path.join(markdown_directory, markdown_filename)
+            print(f"Processing file {index} of {total_files}: {filename}")
+            if args.split:
+                pdf_to_markdown_split(pdf_path, os.path.splitext(markdown_path)[0])
+            else:
+                pdf_to_markdown(pdf_path, markdown_path, converter_to_use, archive, args.incremental)
+            print(f"Completed file {index} of {total_files}: {filename}")
+    finally:
+        if archive is not None:
+            archive.close()
 
     print(f"All {total_files} PDF files have been processed.")
 
@@ -5,6 +5,8 @@ import argparse
 import logging
 import os
 
+from utils.archive_store import ArchiveReader, ArchiveWriter
+
 def load_config(config_file):
     try:
         with open(config_file, 'r') as f:
@@ -46,43 +48,51 @@ def remove_specific_lines(content):
     
     return '\n'.join(cleaned_lines)
 
-def clean_markdown(input_file, output_file, config):
-    try:
-        logging.info(f"Starting cleaning process for {input_file}")
-        
+def clean_markdown(input_file, output_file, config, input_archive=None, output_archive=None):
+    """Clean a Markdown file.
+
+    If input_archive (an ArchiveReader) is given, input_file is the name of a
+    member to read from it; if output_archive (an ArchiveWriter) is given, the
+    result is stored in it under the file name of output_file. Errors are
+    raised to the caller.
+    """
+    logging.info(f"Starting cleaning process for {input_file}")
+    
+    if input_archive is not None:
+        if input_file not in input_archive:
+            raise FileNotFoundError(input_file)
+        content = input_archive.read_text(input_file)
+    else:
         with open(input_file, "r", encoding="utf-8") as f:
             content = f.read()
-        logging.debug(f"Read {len(content)} characters from {input_file}")
+    logging.debug(f"Read {len(content)} characters from {input_file}")
 
-        cleaned_content = remove_repetitive_text(content, config.get('patterns_to_remove', []))
-        logging.debug("Removed repetitive text")
+    cleaned_content = remove_repetitive_text(content, config.get('patterns_to_remove', []))
+    logging.debug("Removed repetitive text")
 
-        cleaned_content = remove_specific_lines(cleaned_content)
-        logging.debug("Removed specific lines")
+    cleaned_content = remove_specific_lines(cleaned_content)
+    logging.debug("Removed specific lines")
 
+    if output_archive is not None:
+        output_archive.write_text(os.path.basename(output_file), cleaned_content)
+        logging.info(f"Stored cleaned Markdown in {output_archive.archive_dir} as {os.path.basename(output_file)}")
+    else:
         with open(output_file, "w", encoding="utf-8") as f:
             f.write(cleaned_content)
         logging.info(f"Wrote cleaned Markdown to {output_file}")
 
-    except FileNotFoundError:
-        logging.error(f"Input file '{input_file}' not found.")
-        sys.exit(1)
-    except PermissionError:
-        logging.error(f"Permission denied when accessing '{input_file}' or '{output_file}'.")
-        sys.exit(1)
-    except Exception as e:
-        logging.exception(f"An unexpected error occurred: {str(e)}")
-        sys.exit(1)
-
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Clean Markdown files by removing repetitive text.")
-    parser.add_argument("input_file", help="Path to the input Markdown file")
-    parser.add_argument("output_file", help="Path to the output cleaned Markdown file")
+    parser.add_argument("input_file", help="Path to the input Markdown file (member name with --input-archive)")
+    parser.add_argument("output_file", help="Path to the output cleaned Markdown file (member name with --output-archive)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output")
     parser.add_argument("--log-file", help="Path to the log file")
     parser.add_argument("--log-level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], 
                         default='INFO', help="Set the logging level")
     parser.add_argument("--config", default="cleaning_config.yaml", help="Path to the cleaning configuration file")
+    parser.add_argument("--input-archive", help="Read input_file from this sharded Markdown archive")
+    parser.add_argument("--output-archive", help="Store the output in this sharded Markdown archive")
+    parser.add_argument("--codec", choices=["gzip", "zstd"], default="gzip", help="Output archive compression codec")
     return parser.parse_args()
 
 def setup_logging(args):
@@ -107,19 +117,30 @@ def main():
 
     logging.info(f"Starting Markdown cleaning process for {args.input_file}")
 
-    if not os.path.exists(args.input_file):
+    input_archive = ArchiveReader(args.input_archive) if args.input_archive else None
+    if input_archive is None and not os.path.exists(args.input_file):
         logging.error(f"Input file '{args.input_file}' does not exist.")
         sys.exit(1)
 
     config = load_config(args.config)
     logging.info(f"Loaded configuration from {args.config}")
 
+    output_archive = ArchiveWriter(args.output_archive, codec=args.codec) if args.output_archive else None
     try:
-        clean_markdown(args.input_file, args.output_file, config)
+        clean_markdown(args.input_file, args.output_file, config, input_archive, output_archive)
         logging.info("Markdown cleaning completed successfully")
+    except FileNotFoundError:
+        logging.error(f"Input file '{args.input_file}' not found.")
+        sys.exit(1)
+    except PermissionError:
+        logging.error(f"Permission denied when accessing '{args.input_file}' or '{args.output_file}'.")
+        sys.exit(1)
     except Exception as e:
         logging.exception(f"An error occurred while processing the file: {str(e)}")
         sys.exit(1)
+    finally:
+        if output_archive is not None:
+            output_archive.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+"""Deduplicate Markdown sections across framework versions and diff versions."""
+import sys
+import argparse
+import logging
+
+from utils.section_store import ingest_directory, load_manifest, restore_view, diff_manifests
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Content-addressed store for Markdown sections.")
+    parser.add_argument("--store", default="data/section_store", help="Path to the section store directory")
+    parser.add_argument("--log-level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        default='WARNING', help="Set the logging level")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Store a directory of Markdown files as a view")
+    ingest.add_argument("md_dir", help="Directory containing Markdown files")
+    ingest.add_argument("view", help="Name of the view, e.g. netframework-4.5.2")
+
+    diff = subparsers.add_parser("diff", help="List sections that changed between two views")
+    diff.add_argument("old_view", help="View to compare from")
+    diff.add_argument("new_view", help="View to compare to")
+
+    restore = subparsers.add_parser("restore", help="Rebuild the Markdown files of a view")
+    restore.add_argument("view", help="Name of the view to restore")
+    restore.add_argument("output_dir", help="Directory to write the Markdown files to")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=getattr(logging, args.log_level),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        if args.command == "ingest":
+            manifest, new_sections, total_sections = ingest_directory(args.md_dir, args.store, args.view)
+            print(f"Ingested {len(manifest)} files into view '{args.view}': "
+                  f"{total_sections} sections, {new_sections} new")
+        elif args.command == "diff":
+            changes = diff_manifests(load_manifest(args.store, args.old_view),
+                                     load_manifest(args.store, args.new_view))
+            for status, filename, section_type, heading in changes:
+                print(f"{status}\t{filename}\t{section_type}\t{heading}")
+            print(f"{len(changes)} sections differ between '{args.old_view}' and '{args.new_view}'")
+        elif args.command == "restore":
+            count = restore_view(args.store, args.view, args.output_dir)
+            print(f"Restored {count} files to {args.output_dir}")
+    except FileNotFoundError as e:
+        logging.error(f"File not found: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
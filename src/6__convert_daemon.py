@@ -0,0 +1,341 @@
+"""Resident conversion service with a pool of pre-warmed converter workers.
+
+Jobs are accepted as JSON over HTTP on localhost:
+
+    POST /convert  {"pdf": "...", "markdown": "...", "converter": "pdfplumber", "wait": true}
+    POST /clean    {"input": "...", "output": "...", "config": "cleaning_config.yaml", "wait": true}
+    GET  /jobs/<id>
+    GET  /status
+
+Each worker process imports the converters, reads config.ini and the cleaning
+configuration once at startup, so a job only pays for the conversion itself.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import argparse
+import importlib
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import project_paths  # Adds the project root to sys.path
+from converters import get_converter, get_fallback_converter, available_converters, DEFAULT_CONVERTER
+from utils.configure_paths import get_config_settings
+
+DEFAULT_PORT = 8765
+DEFAULT_CLEANING_CONFIG = "cleaning_config.yaml"
+LATENCY_WINDOW = 1000
+MAX_TRACKED_JOBS = 10000
+
+# Per-worker state, populated by warm_worker
+_pdfconvert = None
+_cleaner = None
+_cleaning_configs = {}
+
+
+def warm_worker(converter, cleaning_config_file):
+    """Import converters and load configuration once per worker process."""
+    global _pdfconvert, _cleaner
+    _pdfconvert = importlib.import_module("3__pdfconvert")
+    _cleaner = importlib.import_module("4__simple_md_clean")
+    get_converter(converter)
+    fallback = get_fallback_converter(converter)
+    try:
+        get_converter(fallback)
+    except ImportError as e:
+        # The fallback backend is optional; without it empty output just stays empty
+        logging.warning(f"Fallback converter {fallback} is unavailable: {e}")
+    _cleaning_configs[cleaning_config_file] = _cleaner.load_config(cleaning_config_file)
+
+
+def run_convert_job(pdf_path, markdown_path, converter):
+    """Convert one PDF in a worker process. Returns True if the conversion succeeded."""
+    return _pdfconvert.pdf_to_markdown(pdf_path, markdown_path, converter)
+
+
+def run_clean_job(input_file, output_file, cleaning_config_file):
+    """Clean one Markdown file in a worker process. Errors fail the job."""
+    if cleaning_config_file not in _cleaning_configs:
+        _cleaning_configs[cleaning_config_file] = _cleaner.load_config(cleaning_config_file)
+    _cleaner.clean_markdown(input_file, output_file, _cleaning_configs[cleaning_config_file])
+    return True
+
+
+def _public_job(job):
+    """Return the JSON-serialisable fields of a job."""
+    return {key: value for key, value in job.items() if key not in ("future", "args")}
+
+
+class ConversionService:
+    """Submits jobs to the worker pool and tracks queue depth and latency."""
+
+    def __init__(self, workers, converter, output_folder, cleaning_config_file):
+        self.converter = converter
+        self.output_folder = output_folder
+        self.cleaning_config_file = cleaning_config_file
+        self.workers = workers
+        self.executor = self._create_executor()
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.finished_ids = deque()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=warm_worker,
+            initargs=(self.converter, self.cleaning_config_file),
+        )
+
+    def _replace_broken_executor(self, broken):
+        """Start a new worker pool unless another thread already replaced the broken one."""
+        with self.lock:
+            if self.executor is broken:
+                logging.warning("Worker pool is broken (a worker died); starting a new one")
+                self.executor = self._create_executor()
+                broken.shutdown(wait=False)
+
+    def warm_up(self, workers):
+        """Start every worker process now rather than on the first job."""
+        futures = [self.executor.submit(time.sleep, 0) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, kind, func, *args):
+        """Queue a job and return its id."""
+        job_id = uuid.uuid4().hex
+        submitted = time.time()
+        with self.lock:
+            self.pending += 1
+            self.jobs[job_id] = {"id": job_id, "kind": kind, "args": args, "status": "queued"}
+        executor = self.executor
+        try:
+            try:
+                future = executor.submit(func, *args)
+            except BrokenProcessPool:
+                self._replace_broken_executor(executor)
+                future = self.executor.submit(func, *args)
+        except Exception:
+            with self.lock:
+                self.pending -= 1
+                del self.jobs[job_id]
+            raise
+        self.jobs[job_id]["future"] = future
+        future.add_done_callback(lambda f: self._finish(job_id, submitted, f))
+        return job_id
+
+    def submit_convert(self, pdf_path, markdown_path=None, converter=None):
+        if markdown_path is None:
+            markdown_name = os.path.splitext(os.path.basename(pdf_path))[0] + ".md"
+            markdown_path = os.path.join(self.output_folder, markdown_name)
+        return self.submit("convert", run_convert_job, pdf_path, markdown_path,
+                           converter or self.converter)
+
+    def submit_clean(self, input_file, output_file, cleaning_config_file=None):
+        return self.submit("clean", run_clean_job, input_file, output_file,
+                           cleaning_config_file or self.cleaning_config_file)
+
+    def _finish(self, job_id, submitted, future):
+        latency = time.time() - submitted
+        error = future.exception()
+        ok = error is None and future.result()
+        with self.lock:
+            self.pending -= 1
+            self.latencies.append(latency)
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            job = self.jobs[job_id]
+            job["status"] = "done" if ok else "failed"
+            job["latency"] = round(latency, 3)
+            if error is not None:
+                job["error"] = str(error)
+            self.finished_ids.append(job_id)
+            if len(self.finished_ids) > MAX_TRACKED_JOBS:
+                self.jobs.pop(self.finished_ids.popleft(), None)
+        logging.info(f"Job {job_id} {job['status']} in {latency:.2f}s")
+
+    def job_status(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return _public_job(job)
+
+    def wait(self, job_id):
+        # Hold on to the job itself; it may be evicted from self.jobs once finished
+        job = self.jobs[job_id]
+        try:
+            job["future"].result()
+        except Exception:
+            pass
+        # The done callback may still be running on another thread
+        while job["status"] == "queued":
+            time.sleep(0.01)
+        return _public_job(job)
+
+    def status(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            stats = {
+                "queue_depth": self.pending,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+        if latencies:
+            stats["latency_seconds"] = {
+                "mean": round(sum(latencies) / len(latencies), 3),
+                "p50": round(latencies[len(latencies) // 2], 3),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                "max": round(latencies[-1], 3),
+            }
+        return stats
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def watch_directory(service, watch_dir, interval, stop_event):
+    """Submit conversions for PDF files that appear in watch_dir."""
+    seen = set(f for f in os.listdir(watch_dir) if f.endswith(".pdf"))
+    sizes = {}
+    logging.info(f"Watching {watch_dir} for new PDF files ({len(seen)} already present)")
+    while not stop_event.wait(interval):
+        for filename in os.listdir(watch_dir):
+            if not filename.endswith(".pdf") or filename in seen:
+                continue
+            size = os.path.getsize(os.path.join(watch_dir, filename))
+            # Only pick up files whose size is stable across two scans
+            if size > 0 and sizes.get(filename) == size:
+                seen.add(filename)
+                sizes.pop(filename)
+                job_id = service.submit_convert(os.path.join(watch_dir, filename))
+                logging.info(f"Queued new PDF {filename} as job {job_id}")
+            else:
+                sizes[filename] = size
+
+
+def make_handler(service):
+    class ConversionRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status_code, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/status":
+                self._send_json(200, service.status())
+            elif self.path.startswith("/jobs/"):
+                job = service.job_status(self.path[len("/jobs/"):])
+                if job is None:
+                    self._send_json(404, {"error": "Unknown job"})
+                else:
+                    self._send_json(200, job)
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+                if self.path == "/convert":
+                    converter = request.get("converter")
+                    if converter is not None and converter not in available_converters():
+                        raise ValueError(f"unknown converter '{converter}'")
+                    job_id = service.submit_convert(
+                        request["pdf"], request.get("markdown"), converter
+                    )
+                elif self.path == "/clean":
+                    job_id = service.submit_clean(
+                        request["input"], request["output"], request.get("config")
+                    )
+                else:
+                    self._send_json(404, {"error": "Not found"})
+                    return
+            except (KeyError, TypeError, ValueError) as e:
+                self._send_json(400, {"error": f"Bad request: {e}"})
+                return
+            except BrokenProcessPool as e:
+                self._send_json(503, {"error": f"Worker pool unavailable: {e}"})
+                return
+
+            if request.get("wait"):
+                self._send_json(200, service.wait(job_id))
+            else:
+                self._send_json(202, service.job_status(job_id))
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return ConversionRequestHandler
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Run a resident PDF to Markdown conversion service.")
+    parser.add_argument("--config", default="config.ini", help="Path to the configuration file")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Number of worker processes")
+    parser.add_argument("--converter", help="Default converter (default: from config file)")
+    parser.add_argument("--cleaning_config", default=DEFAULT_CLEANING_CONFIG,
+                        help="Path to the cleaning configuration file")
+    parser.add_argument("--watch", action="store_true",
+                        help="Convert new PDF files that appear in the input folder")
+    parser.add_argument("--watch_interval", type=float, default=5.0, help="Seconds between watch scans")
+    parser.add_argument("--log-level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        default='INFO', help="Set the logging level")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=getattr(logging, args.log_level),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    input_folder, output_folder, converter = get_config_settings(args.config)
+    converter = args.converter or converter
+    if converter not in available_converters():
+        logging.warning(f"Unknown converter '{converter}', using {DEFAULT_CONVERTER}")
+        converter = DEFAULT_CONVERTER
+    os.makedirs(output_folder, exist_ok=True)
+
+    service = ConversionService(args.workers, converter, output_folder, args.cleaning_config)
+    logging.info(f"Warming {args.workers} workers with converter {converter}")
+    service.warm_up(args.workers)
+
+    stop_event = threading.Event()
+    if args.watch:
+        watcher = threading.Thread(
+            target=watch_directory,
+            args=(service, input_folder, args.watch_interval, stop_event),
+            daemon=True,
+        )
+        watcher.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    logging.info(f"Conversion service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down conversion service")
+    finally:
+        stop_event.set()
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
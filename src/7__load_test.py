@@ -0,0 +1,155 @@
+"""Offline load test of the PDF download flow against a local docs stand-in.
+
+Starts the stand-in server from utils.docs_standin (or targets one given with
+--base_url) and replays the downloader's flow over plain HTTP: load the
+namespace page, find the download-pdf button, follow the pdf?url= link and
+save the PDF with the same save_pdf helper used by 2__get_pdfs_windows.py.
+Reports links/minute, latency and failures at each concurrency level.
+
+The load test does not drive Selenium or download_pdf itself; it matches the
+download button with a regular expression. To regression-test the browser
+code, use --serve to only run the stand-in and point the scripts at it:
+
+    python 7__load_test.py --serve --port 8000 --write_links standin_links.txt
+    python 1__scrape_links.py --url http://127.0.0.1:8000/en-us/dotnet/api/?view=netframework-4.5.2
+    python 2__get_pdfs_windows.py --links_file standin_links.txt
+"""
+import os
+import re
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config import PROJECT_ROOT
+from utils.browser_options import LatencyRecorder
+from utils.docs_standin import start_standin_server, namespace_links, DEFAULT_VIEW
+from utils.download_operations import pdf_filename_for_link, save_pdf
+
+PDF_BUTTON_PATTERN = re.compile(
+    r"data-bi-name=\"download-pdf\"[^>]*window\.location\.href='([^']+)'"
+)
+
+
+def fetch_link(session, link, idx, download_dir):
+    """Run the download flow for one link. Returns an outcome label."""
+    try:
+        page = session.get(link, timeout=30)
+        if page.status_code != 200:
+            return f"page_http_{page.status_code}"
+        match = PDF_BUTTON_PATTERN.search(page.text)
+        if not match:
+            return "no_pdf_button"
+        pdf_url = urljoin(link, match.group(1))
+        pdf_path = os.path.join(download_dir, pdf_filename_for_link(link, idx))
+        return "ok" if save_pdf(session, pdf_url, pdf_path, idx) else "truncated_or_empty"
+    except requests.HTTPError as e:
+        return f"pdf_http_{e.response.status_code}"
+    except requests.RequestException as e:
+        return type(e).__name__
+
+
+def run_level(links, concurrency, work_dir):
+    """Download every link with the given number of threads and return the results."""
+    latency = LatencyRecorder(f"Concurrency {concurrency}")
+    unique_links = len(set(links))
+    local = threading.local()
+
+    def task(item):
+        idx, link = item
+        # A directory per round so repeated links land in distinct files
+        download_dir = os.path.join(work_dir, f"round_{idx // unique_links}")
+        os.makedirs(download_dir, exist_ok=True)
+        # Each thread keeps its own session, like one browser per worker
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        with latency.time():
+            return fetch_link(local.session, link, idx, download_dir)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = Counter(executor.map(task, enumerate(links)))
+    elapsed = time.perf_counter() - start
+
+    leftovers = 0
+    for root, _, files in os.walk(work_dir):
+        leftovers += sum(1 for f in files if f.endswith(".part"))
+    return outcomes, elapsed, latency, leftovers
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Load test the PDF download flow against a local docs stand-in.")
+    parser.add_argument("--pdf_dir", default=os.path.join(PROJECT_ROOT, "data", "testPdfsSmall"),
+                        help="Directory of fixture PDFs served by the stand-in")
+    parser.add_argument("--base_url", help="Use an already running stand-in instead of starting one")
+    parser.add_argument("--port", type=int, default=0, help="Port for the stand-in (default: any free port)")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--rounds", type=int, default=5, help="Times each fixture namespace is downloaded per level")
+    parser.add_argument("--latency", type=float, default=0.05, help="Base latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Random extra latency per request in seconds")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--truncate_rate", type=float, default=0.0, help="Fraction of PDF responses cut short")
+    parser.add_argument("--seed", type=int, help="Random seed for injected faults")
+    parser.add_argument("--serve", action="store_true", help="Only run the stand-in server")
+    parser.add_argument("--write_links", help="Write the stand-in's namespace links to this file")
+    parser.add_argument("--log-level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        default='ERROR', help="Set the logging level")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=getattr(logging, args.log_level),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    server = None
+    base_url = args.base_url
+    namespaces = sorted(os.path.splitext(f)[0] for f in os.listdir(args.pdf_dir) if f.endswith(".pdf"))
+    if not base_url:
+        server, base_url = start_standin_server(
+            args.pdf_dir, port=args.port, latency=args.latency, jitter=args.jitter,
+            error_rate=args.error_rate, truncate_rate=args.truncate_rate, seed=args.seed,
+        )
+        print(f"Docs stand-in serving {len(namespaces)} namespaces at {base_url}")
+
+    links = namespace_links(base_url, namespaces, DEFAULT_VIEW)
+    if args.write_links:
+        with open(args.write_links, "w", encoding="utf-8") as f:
+            f.write("\n".join(links) + "\n")
+        print(f"Links have been saved to {args.write_links}")
+
+    if args.serve:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            if server is not None:
+                server.shutdown()
+        return
+
+    for concurrency in (int(level) for level in args.concurrency.split(",")):
+        work_dir = tempfile.mkdtemp(prefix="pdf_load_test_")
+        try:
+            outcomes, elapsed, latency, leftovers = run_level(links * args.rounds, concurrency, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        total = sum(outcomes.values())
+        failures = {label: count for label, count in outcomes.items() if label != "ok"}
+        print(f"Concurrency {concurrency}: {total} links in {elapsed:.1f}s, "
+              f"{total / elapsed * 60:.0f} links/minute, {outcomes['ok']} ok, "
+              f"failures {failures or 'none'}, partial files left {leftovers}")
+        print(f"  {latency.summary()}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,4 +12,5 @@ LOG_FILE = os.path.join(PROJECT_ROOT, "logs", "pdf_download.log")
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "downloaded_pdfs")
 DEFAULT_LINKS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "scraped_links_netframework-4.5.2.txt")
 # DEFAULT_LINKS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "framework452_links.txt")
+DOCS_API_URL = "https://learn.microsoft.com/en-us/dotnet/api/"
 REQUIREMENTS_DIR = os.path.join(PROJECT_ROOT, "requirements")
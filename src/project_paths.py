@@ -0,0 +1,14 @@
+"""Make the project root importable for the pipeline scripts in src/.
+
+Scripts are run as ``python src/<script>.py``, which only puts src/ on
+sys.path. Importing this module once adds the project root as well, so the
+``converters`` package (and ``src.*`` imports) resolve without each script
+patching sys.path itself.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
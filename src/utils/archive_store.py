@@ -0,0 +1,237 @@
+"""Compressed, sharded storage for Markdown artifacts.
+
+Instead of one small file per namespace, members are compressed individually
+and appended to a few shard files. Each shard has a JSON lines index recording
+the offset and length of every member, so a single member can be read back
+with one seek without unpacking the rest of the shard. Writing a member name
+again appends a new copy; the latest index entry wins, and closing the writer
+compacts the shards so each name keeps only that copy.
+
+A shard must only be appended to by one writer at a time. Workers running in
+parallel should each write to their own archive directory.
+"""
+import os
+import json
+import gzip
+import zlib
+
+SHARD_PATTERN = "shard-{:03d}.bin"
+INDEX_PATTERN = "shard-{:03d}.idx"
+DEFAULT_SHARDS = 4
+CODECS = ("gzip", "zstd")
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The zstd codec requires the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+def compress(data, codec):
+    """Compress bytes with the given codec."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=10).compress(data)
+    raise ValueError(f"Unknown codec: {codec}. Available codecs: {', '.join(CODECS)}")
+
+
+def decompress(data, codec):
+    """Decompress bytes written with the given codec."""
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown codec: {codec}. Available codecs: {', '.join(CODECS)}")
+
+
+def shard_for(name, shards):
+    """Return the shard number a member name is stored in."""
+    return zlib.crc32(name.encode("utf-8")) % shards
+
+
+def is_archive(path):
+    """Return True if path is an archive directory."""
+    return os.path.isfile(os.path.join(path, INDEX_PATTERN.format(0)))
+
+
+class ArchiveWriter:
+    """Appends compressed members to the shards of an archive directory."""
+
+    def __init__(self, archive_dir, codec="gzip", shards=DEFAULT_SHARDS):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}. Available codecs: {', '.join(CODECS)}")
+        if shards < 1:
+            raise ValueError(f"Shard count must be at least 1, got {shards}")
+        if codec == "zstd":
+            _zstd()
+        os.makedirs(archive_dir, exist_ok=True)
+        self.archive_dir = archive_dir
+        self.codec = codec
+        self.shards = _read_shard_count(archive_dir) or shards
+        self._files = {}
+        for shard in range(self.shards):
+            # Create every index up front so readers can discover the shard count
+            open(os.path.join(archive_dir, INDEX_PATTERN.format(shard)), "a").close()
+
+    def _open_shard(self, shard):
+        if shard not in self._files:
+            index_path = os.path.join(self.archive_dir, INDEX_PATTERN.format(shard))
+            with open(index_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    # End a line left half-written by a crash so the next entry parses
+                    needs_newline = f.read(1) != b"\n"
+                else:
+                    needs_newline = False
+            data_file = open(os.path.join(self.archive_dir, SHARD_PATTERN.format(shard)), "ab")
+            index_file = open(index_path, "a", encoding="utf-8")
+            if needs_newline:
+                index_file.write("\n")
+            self._files[shard] = (data_file, index_file)
+        return self._files[shard]
+
+    def write_bytes(self, name, data):
+        """Compress and append a member."""
+        shard = shard_for(name, self.shards)
+        data_file, index_file = self._open_shard(shard)
+        compressed = compress(data, self.codec)
+        offset = data_file.tell()
+        data_file.write(compressed)
+        data_file.flush()
+        entry = {"name": name, "offset": offset, "length": len(compressed),
+                 "size": len(data), "codec": self.codec}
+        index_file.write(json.dumps(entry) + "\n")
+        index_file.flush()
+
+    def write_text(self, name, text):
+        """Compress and append a text member as UTF-8."""
+        self.write_bytes(name, text.encode("utf-8"))
+
+    def compact(self):
+        """Rewrite shards holding superseded or partial entries, keeping the latest copy of each name.
+
+        Returns the number of index entries dropped.
+        """
+        self._close_files()
+        dropped = 0
+        for shard in range(self.shards):
+            data_path = os.path.join(self.archive_dir, SHARD_PATTERN.format(shard))
+            index_path = os.path.join(self.archive_dir, INDEX_PATTERN.format(shard))
+            entries, line_count = _read_index(index_path)
+            if len(entries) == line_count:
+                continue
+            with open(data_path, "rb") as old_data, open(data_path + ".tmp", "wb") as new_data, \
+                    open(index_path + ".tmp", "w", encoding="utf-8") as new_index:
+                for entry in sorted(entries.values(), key=lambda e: e["offset"]):
+                    old_data.seek(entry["offset"])
+                    entry["offset"] = new_data.tell()
+                    new_data.write(old_data.read(entry["length"]))
+                    new_index.write(json.dumps(entry) + "\n")
+            os.replace(data_path + ".tmp", data_path)
+            os.replace(index_path + ".tmp", index_path)
+            dropped += line_count - len(entries)
+        return dropped
+
+    def _close_files(self):
+        for data_file, index_file in self._files.values():
+            data_file.close()
+            index_file.close()
+        self._files = {}
+
+    def close(self):
+        self._close_files()
+        self.compact()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArchiveReader:
+    """Random and streaming access to the members of an archive directory."""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.shards = _read_shard_count(archive_dir)
+        if not self.shards:
+            raise FileNotFoundError(f"No archive found in {archive_dir}")
+        self.index = {}
+        for shard in range(self.shards):
+            entries, _ = _read_index(os.path.join(archive_dir, INDEX_PATTERN.format(shard)))
+            for entry in entries.values():
+                entry["shard"] = shard
+                self.index[entry["name"]] = entry
+
+    def names(self):
+        """Return the member names, sorted."""
+        return sorted(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def read_bytes(self, name):
+        """Read and decompress one member."""
+        entry = self.index[name]
+        with open(os.path.join(self.archive_dir, SHARD_PATTERN.format(entry["shard"])), "rb") as f:
+            f.seek(entry["offset"])
+            return decompress(f.read(entry["length"]), entry["codec"])
+
+    def read_text(self, name):
+        """Read and decompress one text member."""
+        return self.read_bytes(name).decode("utf-8")
+
+    def iter_texts(self):
+        """Yield (name, text) for every member, reading each shard sequentially."""
+        by_shard = {}
+        for entry in self.index.values():
+            by_shard.setdefault(entry["shard"], []).append(entry)
+        for shard, entries in sorted(by_shard.items()):
+            entries.sort(key=lambda e: e["offset"])
+            with open(os.path.join(self.archive_dir, SHARD_PATTERN.format(shard)), "rb") as f:
+                for entry in entries:
+                    f.seek(entry["offset"])
+                    data = decompress(f.read(entry["length"]), entry["codec"])
+                    yield entry["name"], data.decode("utf-8")
+
+
+def _read_index(index_path):
+    """Return ({name: latest entry}, number of non-empty lines) for a shard index."""
+    entries = {}
+    line_count = 0
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            line_count += 1
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A writer interrupted mid-line leaves a partial entry; skip it
+                continue
+            entries[entry["name"]] = entry
+    return entries, line_count
+
+
+def _read_shard_count(archive_dir):
+    """Return the number of shards in an existing archive, or 0."""
+    shards = 0
+    while os.path.isfile(os.path.join(archive_dir, INDEX_PATTERN.format(shards))):
+        shards += 1
+    return shards
+
+
+def iter_markdown(path):
+    """Yield (name, text) for each Markdown document in an archive or a plain directory."""
+    if is_archive(path):
+        yield from ArchiveReader(path).iter_texts()
+        return
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith(".md"):
+            with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
+                yield filename, f.read()
@@ -6,6 +6,14 @@ import sys
 from utils.configure_paths import get_config_settings
 
 
+def positive_int(value):
+    """argparse type for integers of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def parse_arguments():
     """Parse command-line arguments for the PDF to Markdown converter."""
     parser = argparse.ArgumentParser(description="Convert PDF files to Markdown.")
@@ -15,13 +23,25 @@ def parse_arguments():
     parser.add_argument(
         "converter",
         nargs="?",
-        choices=["pdfplumber", "markdownify"],
         default="pdfplumber",
-        help="Converter to use (default: pdfplumber)",
+        help="Converter to use (default: pdfplumber, see --list-converters)",
     )
+    parser.add_argument("--list-converters", action="store_true", help="List available converters and exit")
     parser.add_argument('--parallel', action='store_true', help='Enable parallel processing for downloading PDFs.')    
     parser.add_argument("--download_dir", help="Directory to save downloaded PDFs")
     parser.add_argument("--links_file", help="File containing links to process")
+    parser.add_argument("--lean", action="store_true",
+                        help="Block images, fonts, stylesheets and telemetry and use eager page loads when downloading")
+    parser.add_argument("--archive", action="store_true",
+                        help="Store Markdown as compressed members of a sharded archive in md_dir")
+    parser.add_argument("--codec", choices=["gzip", "zstd"], default="gzip", help="Archive compression codec")
+    parser.add_argument("--shards", type=positive_int, default=4, help="Number of archive shard files")
+    parser.add_argument("--split", action="store_true",
+                        help="Write one Markdown file per type into a directory per PDF, with an index.json")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-extract pages that changed since the last run (pdfplumber)")
+    parser.add_argument("--queue_dir", help="Shared directory holding the work queue for multi-node runs")
+    parser.add_argument("--worker_id", help="Identifier of this worker in the work queue (default: host-pid)")
     return parser.parse_args()
 
 
@@ -0,0 +1,88 @@
+"""Lean Chrome session settings shared by the scraping and download stages."""
+import time
+import logging
+
+# Resources the docs pages do not need for link extraction or the PDF button flow
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+    "*.mp4", "*.webm",
+    # Telemetry and analytics
+    "*js.monitor.azure.com*",
+    "*browser.events.data.microsoft.com*",
+    "*mscom.demdex.net*",
+    "*.clarity.ms*",
+    "*.doubleclick.net*",
+    "*google-analytics.com*",
+]
+
+LEAN_CONTENT_SETTINGS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+
+
+def apply_lean_options(options):
+    """Configure Chrome options for a lean session: eager page loads and no images."""
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    prefs = options.experimental_options.get("prefs", {})
+    prefs.update(LEAN_CONTENT_SETTINGS)
+    options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Block non-essential resource requests through the Chrome DevTools Protocol."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    logging.info(f"Blocking {len(patterns)} resource URL patterns")
+
+
+def keep_single_tab(driver, main_handle):
+    """Close any tabs opened since main_handle and switch back to it."""
+    for handle in driver.window_handles:
+        if handle != main_handle:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(main_handle)
+
+
+class LatencyRecorder:
+    """Collects per-item latencies for a stage and summarises them."""
+
+    def __init__(self, stage, unit="links"):
+        self.stage = stage
+        self.unit = unit
+        self.latencies = []
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+
+    def time(self):
+        """Return a context manager that records the duration of its block."""
+        return _Timer(self)
+
+    def summary(self):
+        if not self.latencies:
+            return f"{self.stage}: no items timed"
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        mean = sum(latencies) / count
+        p50 = latencies[count // 2]
+        p95 = latencies[min(count - 1, int(count * 0.95))]
+        return (f"{self.stage}: {count} {self.unit}, mean {mean:.2f}s, p50 {p50:.2f}s, "
+                f"p95 {p95:.2f}s, max {latencies[-1]:.2f}s")
+
+
+class _Timer:
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record(time.perf_counter() - self.start)
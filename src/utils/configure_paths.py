@@ -1,10 +1,5 @@
-import os
-import sys
 import configparser
 
-# Add the parent directory to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 def read_config(config_file="config.ini"):
     """
     Reads configuration settings from a specified INI file.
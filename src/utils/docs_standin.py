@@ -0,0 +1,133 @@
+"""Local stand-in for the learn.microsoft.com .NET API docs used in offline tests.
+
+Serves an index page linking to one page per fixture namespace, namespace
+pages with the ``download-pdf`` button, and the ``pdf?url=`` flow: the first
+request is redirected to a URL that still contains ``pdf?url=`` (as the
+downloader expects), which then serves the fixture PDF. Latency, server
+errors and truncated PDF bodies can be injected to exercise failure handling.
+"""
+import os
+import time
+import random
+import logging
+import threading
+from html import escape
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PATH = "/en-us/dotnet/api/"
+DEFAULT_VIEW = "netframework-4.5.2"
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(server.latency + server.rng.uniform(0, server.jitter))
+        if server.error_rate and server.rng.random() < server.error_rate:
+            self._send(503, "text/plain", b"Service temporarily unavailable")
+            return
+
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if parts.path == "/pdf":
+            self._serve_pdf(query)
+        elif parts.path.rstrip("/") + "/" == API_PATH:
+            self._serve_index(query.get("view", [DEFAULT_VIEW])[0])
+        elif parts.path.startswith(API_PATH):
+            self._serve_namespace(parts.path[len(API_PATH):], query.get("view", [DEFAULT_VIEW])[0])
+        else:
+            self._send(404, "text/plain", b"Not found")
+
+    def _serve_index(self, view):
+        items = "".join(
+            f'<li><a href="{API_PATH}{escape(ns)}?view={escape(view)}">{escape(ns)}</a></li>'
+            for ns in self.server.namespaces
+        )
+        self._send(200, "text/html", f"<html><body><ul>{items}</ul></body></html>".encode("utf-8"))
+
+    def _serve_namespace(self, namespace, view):
+        if namespace not in self.server.namespaces:
+            self._send(404, "text/plain", b"Not found")
+            return
+        pdf_link = f"/pdf?url={quote(API_PATH + namespace)}&view={quote(view)}"
+        body = (
+            f"<html><body><h1>{escape(namespace)} Namespace</h1>"
+            f"<button data-bi-name=\"download-pdf\" "
+            f"onclick=\"window.location.href='{pdf_link}'\">Download PDF</button>"
+            f"</body></html>"
+        )
+        self._send(200, "text/html", body.encode("utf-8"))
+
+    def _serve_pdf(self, query):
+        namespace = query.get("url", [""])[0].rstrip("/").split("/")[-1]
+        if namespace not in self.server.namespaces:
+            self._send(404, "text/plain", b"Not found")
+            return
+        if "blob" not in query:
+            # The real site redirects to the generated PDF; keep pdf?url= in the target
+            self.send_response(302)
+            self.send_header("Location", f"{self.path}&blob=1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(os.path.join(self.server.pdf_dir, namespace + ".pdf"), "rb") as f:
+            data = f.read()
+        if self.server.truncate_rate and self.server.rng.random() < self.server.truncate_rate:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(data[: len(data) // 2])
+            self.close_connection = True
+            return
+        self._send(200, "application/pdf", data)
+
+    def _send(self, status_code, content_type, body):
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def create_standin_server(pdf_dir, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                          error_rate=0.0, truncate_rate=0.0, seed=None):
+    """Create a stand-in docs server for the fixture PDFs in pdf_dir.
+
+    latency and jitter are in seconds per request; error_rate and
+    truncate_rate are probabilities between 0 and 1.
+    """
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.pdf_dir = pdf_dir
+    server.namespaces = sorted(
+        os.path.splitext(f)[0] for f in os.listdir(pdf_dir) if f.endswith(".pdf")
+    )
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.truncate_rate = truncate_rate
+    server.rng = random.Random(seed)
+    return server
+
+
+def start_standin_server(pdf_dir, **kwargs):
+    """Start a stand-in server on a background thread. Returns (server, base_url)."""
+    server = create_standin_server(pdf_dir, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def namespace_links(base_url, namespaces, view=DEFAULT_VIEW):
+    """Return the namespace page links served by a stand-in server."""
+    return [f"{base_url}{API_PATH}{ns}?view={view}" for ns in namespaces]
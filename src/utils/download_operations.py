@@ -0,0 +1,60 @@
+"""Helpers for fetching documentation PDFs over HTTP."""
+import os
+import logging
+from urllib.parse import urlparse
+
+
+def pdf_filename_for_link(link, idx):
+    """Return the PDF file name for a docs link, e.g. system.io.pdf."""
+    pdf_filename = urlparse(link).path.split("/")[-1]
+    if not pdf_filename:
+        pdf_filename = f"default_{idx}"
+    return pdf_filename + ".pdf"
+
+
+def save_pdf(http, pdf_url, pdf_path, idx, timeout=30):
+    """Stream a PDF to pdf_path using http (requests or a requests.Session).
+
+    The body is written to a temporary .part file that only replaces pdf_path
+    once it is complete, so an interrupted or truncated response never leaves a
+    file that a later run would mistake for a finished download. Network
+    errors are raised after the partial file is removed; an empty or short
+    body returns False.
+    """
+    pdf_filename = os.path.basename(pdf_path)
+    part_path = pdf_path + ".part"
+    try:
+        response = http.get(pdf_url, stream=True, timeout=timeout)
+        response.raise_for_status()
+
+        written = 0
+        with open(part_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=8192):
+                file.write(chunk)
+                written += len(chunk)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    expected = response.headers.get("Content-Length")
+    received = written
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        # Content-Length counts the encoded bytes; compare against what came off the wire
+        received = response.raw.tell()
+    if expected is not None and expected.isdigit() and received != int(expected):
+        logging.warning(
+            "Truncated download for link %s: %s (%s of %s bytes)", idx, pdf_filename, received, expected
+        )
+        os.remove(part_path)
+        return False
+
+    if written <= 0:
+        logging.warning("Downloaded file is empty for link %s: %s", idx, pdf_filename)
+        os.remove(part_path)
+        logging.warning("Deleted empty PDF file for link %s: %s", idx, pdf_filename)
+        return False
+
+    os.replace(part_path, pdf_path)
+    logging.info("Successfully downloaded PDF for link %s: %s", idx, pdf_filename)
+    return True
@@ -1,5 +1,32 @@
 
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Hosts whose URL paths are case-insensitive, e.g. System.IO and system.io are the same page
+CASE_INSENSITIVE_HOSTS = {"learn.microsoft.com"}
+
 def read_links_from_file(file_path):
     """Read links from a file and return a list of non-empty links."""
     with open(file_path, "r", encoding="utf-8") as file:
         return [link.strip() for link in file.readlines() if link.strip()]
+
+def normalize_link(link):
+    """Normalize a docs link: lowercase scheme and host, drop the fragment, sort the query.
+
+    Paths on case-insensitive hosts such as learn.microsoft.com are lowercased too.
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    path = parts.path.lower() if host in CASE_INSENSITIVE_HOSTS else parts.path
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), host, path, query, ""))
+
+def deduplicate_links(links):
+    """Normalize links and drop duplicates, keeping the first occurrence order."""
+    seen = set()
+    unique_links = []
+    for link in links:
+        normalized = normalize_link(link)
+        if normalized not in seen:
+            seen.add(normalized)
+            unique_links.append(normalized)
+    return unique_links
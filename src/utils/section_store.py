@@ -0,0 +1,183 @@
+"""Content-addressed storage of Markdown sections shared across framework versions."""
+import os
+import re
+import json
+import difflib
+import hashlib
+import logging
+
+OBJECTS_DIR = "objects"
+MANIFESTS_DIR = "manifests"
+# ATX heading: up to three spaces of indentation, one to six '#', then a space or end of line
+HEADING_PATTERN = re.compile(r" {0,3}#{1,6}(\s|$)")
+
+
+def split_sections(content):
+    """Split Markdown content into (heading, text) sections on ATX headings.
+
+    Text before the first heading is returned as a section with an empty heading.
+    Headings inside fenced code blocks and lines such as C# #region directives
+    are not headings. Joining the section texts
+    reproduces the original content exactly.
+    """
+    sections = []
+    heading = ""
+    current = []
+    in_fence = False
+    for line in content.splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and HEADING_PATTERN.match(line):
+            if current:
+                sections.append((heading, "".join(current)))
+            heading = stripped.strip()
+            current = []
+        current.append(line)
+    if current:
+        sections.append((heading, "".join(current)))
+    return sections
+
+
+def hash_section(text):
+    """Return the SHA-256 hex digest of a section's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def object_path(store_dir, digest):
+    """Return the path of the object file for a digest."""
+    return os.path.join(store_dir, OBJECTS_DIR, digest[:2], digest[2:])
+
+
+def manifest_path(store_dir, view):
+    """Return the path of the manifest file for a view."""
+    return os.path.join(store_dir, MANIFESTS_DIR, f"{view}.json")
+
+
+def put_section(store_dir, text):
+    """Store a section once and return its digest."""
+    digest = hash_section(text)
+    path = object_path(store_dir, digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    return digest
+
+
+def get_section(store_dir, digest):
+    """Read a stored section by digest."""
+    with open(object_path(store_dir, digest), "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def ingest_directory(markdown_dir, store_dir, view):
+    """Store every Markdown file in a directory and write the view's manifest.
+
+    Returns a tuple (manifest, new_sections, total_sections).
+    """
+    manifest = {}
+    new_sections = 0
+    total_sections = 0
+    for filename in sorted(os.listdir(markdown_dir)):
+        if not filename.endswith(".md"):
+            continue
+        with open(os.path.join(markdown_dir, filename), "r", encoding="utf-8", newline="") as f:
+            content = f.read()
+        entries = []
+        for heading, text in split_sections(content):
+            digest = hash_section(text)
+            if not os.path.exists(object_path(store_dir, digest)):
+                new_sections += 1
+                put_section(store_dir, text)
+            entries.append({"heading": heading, "hash": digest})
+            total_sections += 1
+        manifest[filename] = entries
+        logging.info(f"Ingested {len(entries)} sections from {filename}")
+
+    path = manifest_path(store_dir, view)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest, new_sections, total_sections
+
+
+def load_manifest(store_dir, view):
+    """Load the manifest of a view."""
+    with open(manifest_path(store_dir, view), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def restore_view(store_dir, view, output_dir):
+    """Rebuild the Markdown files of a view from the store."""
+    manifest = load_manifest(store_dir, view)
+    os.makedirs(output_dir, exist_ok=True)
+    for filename, entries in manifest.items():
+        content = "".join(get_section(store_dir, entry["hash"]) for entry in entries)
+        with open(os.path.join(output_dir, filename), "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+    return len(manifest)
+
+
+def _heading_level(heading):
+    """Return the ATX level of a heading, or 0 for the preamble."""
+    return len(heading) - len(heading.lstrip("#"))
+
+
+def _section_types(entries):
+    """Return, for each section, the top-level heading (type) it belongs to."""
+    levels = [_heading_level(entry["heading"]) for entry in entries]
+    top_level = min((level for level in levels if level), default=0)
+    types = []
+    current_type = ""
+    for entry, level in zip(entries, levels):
+        if level and level == top_level:
+            current_type = entry["heading"]
+        types.append(current_type)
+    return types
+
+
+def _diff_file(filename, old_entries, new_entries):
+    """Align two section lists on (type, heading, hash) and classify the differences."""
+    old_types = _section_types(old_entries)
+    new_types = _section_types(new_entries)
+    old_keys = [(t, e["heading"], e["hash"]) for t, e in zip(old_types, old_entries)]
+    new_keys = [(t, e["heading"], e["hash"]) for t, e in zip(new_types, new_entries)]
+
+    changes = []
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        # Within a differing block, sections with the same type and heading changed in place
+        unmatched_old = {}
+        for section_type, heading, _ in old_keys[i1:i2]:
+            unmatched_old.setdefault((section_type, heading), 0)
+            unmatched_old[(section_type, heading)] += 1
+        for section_type, heading, _ in new_keys[j1:j2]:
+            if unmatched_old.get((section_type, heading)):
+                unmatched_old[(section_type, heading)] -= 1
+                changes.append(("changed", filename, section_type, heading))
+            else:
+                changes.append(("added", filename, section_type, heading))
+        for (section_type, heading), count in unmatched_old.items():
+            changes.extend([("removed", filename, section_type, heading)] * count)
+    return changes
+
+
+def diff_manifests(old_manifest, new_manifest):
+    """Compare two manifests and return the sections that differ.
+
+    Only the manifests are read, never the section objects. Sections are
+    aligned with a sequence diff, so inserting a type does not shift the
+    sections after it. Returns a list of (status, filename, type, heading)
+    tuples where status is one of 'added', 'removed' or 'changed' and type is
+    the top-level heading the section belongs to.
+    """
+    changes = []
+    for filename in sorted(set(old_manifest) | set(new_manifest)):
+        changes.extend(_diff_file(filename, old_manifest.get(filename, []),
+                                  new_manifest.get(filename, [])))
+    return changes
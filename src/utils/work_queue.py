@@ -0,0 +1,240 @@
+"""Lease-based work queue shared by download and convert workers across machines.
+
+The queue lives in a SQLite database inside a directory that every worker can
+reach: a shared network folder when several VMs cooperate, or any local folder
+when running on a single machine. Workers claim an item for a limited lease,
+renew the lease with heartbeats while processing, and mark it done or failed.
+Items whose lease expires (for example because the worker's VM was deleted)
+become claimable again.
+"""
+import os
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+QUEUE_DB_NAME = "work_queue.sqlite3"
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_SECONDS = 10
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def default_worker_id():
+    """Return an identifier unique to this host and process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """A named queue of work items stored in a shared SQLite database."""
+
+    def __init__(self, queue_dir, name, lease_seconds=DEFAULT_LEASE_SECONDS,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        os.makedirs(queue_dir, exist_ok=True)
+        self.db_path = os.path.join(queue_dir, QUEUE_DB_NAME)
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS items (
+                    queue TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated REAL NOT NULL,
+                    PRIMARY KEY (queue, key)
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS items_claim ON items (queue, status, lease_expires)"
+            )
+
+    def _connect(self):
+        # A connection per call keeps the queue usable from heartbeat threads
+        conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 60000")
+        return _ClosingConnection(conn)
+
+    def enqueue(self, keys):
+        """Add items to the queue, ignoring ones already present. Returns the number added."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (queue, key, status, updated) VALUES (?, ?, ?, ?)",
+                [(self.name, key, STATUS_PENDING, now) for key in keys],
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        return added
+
+    def claim(self, worker_id):
+        """Lease the next available item to worker_id and return its key, or None."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Expired leases on a final attempt cannot be retried
+            conn.execute(
+                """UPDATE items SET status = ?, owner = NULL, lease_expires = NULL,
+                   error = 'lease expired on final attempt', updated = ?
+                   WHERE queue = ? AND status = ? AND lease_expires < ? AND attempts >= ?""",
+                (STATUS_FAILED, now, self.name, STATUS_LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                """SELECT key FROM items
+                   WHERE queue = ? AND attempts < ?
+                     AND (status = ? OR (status = ? AND lease_expires < ?))
+                   ORDER BY updated LIMIT 1""",
+                (self.name, self.max_attempts, STATUS_PENDING, STATUS_LEASED, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                """UPDATE items SET status = ?, owner = ?, lease_expires = ?,
+                   attempts = attempts + 1, updated = ?
+                   WHERE queue = ? AND key = ?""",
+                (STATUS_LEASED, worker_id, now + self.lease_seconds, now, self.name, row[0]),
+            )
+            conn.execute("COMMIT")
+        return row[0]
+
+    def heartbeat(self, key, worker_id):
+        """Extend the lease on key. Returns False if worker_id no longer holds it."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """UPDATE items SET lease_expires = ?, updated = ?
+                   WHERE queue = ? AND key = ? AND owner = ? AND status = ?""",
+                (now + self.lease_seconds, now, self.name, key, worker_id, STATUS_LEASED),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, key, worker_id):
+        """Mark key as done."""
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE items SET status = ?, lease_expires = NULL, error = NULL, updated = ?
+                   WHERE queue = ? AND key = ? AND owner = ?""",
+                (STATUS_DONE, time.time(), self.name, key, worker_id),
+            )
+
+    def fail(self, key, worker_id, error=""):
+        """Release key after a failed attempt; it is retried until max_attempts is reached."""
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE items
+                   SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                       owner = NULL, lease_expires = NULL, error = ?, updated = ?
+                   WHERE queue = ? AND key = ? AND owner = ?""",
+                (self.max_attempts, STATUS_FAILED, STATUS_PENDING, error, time.time(),
+                 self.name, key, worker_id),
+            )
+
+    def counts(self):
+        """Return a dict mapping status to the number of items in that status."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM items WHERE queue = ? GROUP BY status",
+                (self.name,),
+            ).fetchall()
+        return dict(rows)
+
+    def leased_count(self):
+        """Return the number of items currently leased by any worker."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM items WHERE queue = ? AND status = ?",
+                (self.name, STATUS_LEASED),
+            ).fetchone()
+        return row[0]
+
+    def iter_claims(self, worker_id, poll_seconds=DEFAULT_POLL_SECONDS):
+        """Yield claimed keys until no item is claimable or leased.
+
+        While other workers still hold leases, keep polling so that items of a
+        worker that died are reclaimed once their lease expires.
+        """
+        while True:
+            key = self.claim(worker_id)
+            if key is not None:
+                yield key
+            elif self.leased_count() == 0:
+                return
+            else:
+                time.sleep(poll_seconds)
+
+
+class _ClosingConnection:
+    """Context manager that closes a sqlite3 connection on exit."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
+        self.conn.close()
+
+
+@contextmanager
+def lease_heartbeat(queue, key, worker_id, interval=None):
+    """Renew the lease on key in a background thread while the block runs."""
+    interval = interval or max(1, queue.lease_seconds / 3)
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                if not queue.heartbeat(key, worker_id):
+                    logging.warning(f"Lost lease on {key} held by {worker_id}")
+                    return
+            except sqlite3.Error as e:
+                logging.warning(f"Heartbeat failed for {key}: {e}")
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(queue, worker_id, process_item, poll_seconds=DEFAULT_POLL_SECONDS):
+    """Claim and process items until the queue is drained.
+
+    process_item is called with the item key and must return True on success.
+    Returns a tuple (succeeded, failed).
+    """
+    succeeded = failed = 0
+    for key in queue.iter_claims(worker_id, poll_seconds):
+        with lease_heartbeat(queue, key, worker_id):
+            try:
+                ok = process_item(key)
+                error = "" if ok else "processing returned failure"
+            except Exception as e:
+                ok = False
+                error = str(e)
+        if ok:
+            queue.complete(key, worker_id)
+            succeeded += 1
+        else:
+            queue.fail(key, worker_id, error)
+            failed += 1
+            logging.warning(f"Worker {worker_id} failed on {key}: {error}")
+    return succeeded, failed